@@ -1,11 +1,20 @@
+import html
 import io
+import os
 import re
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional, Tuple, List, Set
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 import streamlit as st
 
 # ---------- Constants ----------
@@ -24,55 +33,154 @@ TARGET_LABELS = {
     "Gespräch": "gespraech",
 }
 
+# Column order for the live table, results and exports. Every record carries
+# all of these keys (see extract_fields_from_table and fetch_page).
+ORDERED_COLS = (
+    "page_id", "url",
+    "fach", "ort_uni", "pruefer", "atmosphaere",
+    "dauer", "note", "vorgespraech", "kleidung", "gespraech",
+)
+
+RECORD_SCHEMA = pa.schema(
+    [pa.field("page_id", pa.int64())] + [pa.field(c, pa.string()) for c in ORDERED_COLS[1:]]
+)
+
+# Saved records are written to a Parquet file in row groups of this size, and
+# only the most recent LIVE_WINDOW records are kept in memory for the live table
+SPOOL_FLUSH_EVERY = 100
+LIVE_WINDOW = 200
+
+# Upper bound for parallel fetches; the connection pool is sized to match so
+# no worker ever has to open (and then discard) an extra connection
+MAX_CONCURRENCY = 16
+# IDs fetched per window; the miss streak is evaluated once a window completes
+FETCH_WINDOW = 32
+
+# Pages larger than this are truncated before parsing
+MAX_BODY_BYTES = 2_000_000
+
+# The live table is re-sent to the browser at most this often
+LIVE_TABLE_INTERVAL_S = 1.0
+# Merge the live table's per-record chunks once this many have piled up
+LIVE_RECHUNK_AT = 64
+
+_TRAILING_COLON = re.compile(r"[:：]\s*$")
+_WS = re.compile(r"\s+")
+
+# Fixed-schema fast path: one "<td>Label:</td><td>value</td>" pair per row
+_ATTRS = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+_FAST_ROW = re.compile(
+    r"<td\b" + _ATTRS + r">\s*(" + "|".join(map(re.escape, TARGET_LABELS)) + r")[:：]?\s*</td>"
+    r"\s*<td\b" + _ATTRS + r">(.*?)</td>",
+    re.DOTALL,
+)
+# Values on the fast path may only be text and <br> line breaks
+_BR = re.compile(r"<br\s*/?>", re.IGNORECASE)
+# Anything else that a parser would treat as markup: a tag, end tag, comment,
+# doctype or processing instruction ("ca. <30 Min" is still plain text)
+_MARKUP = re.compile(r"<[A-Za-z/!?]")
+
+
 # ---------- Streamlit config ----------
 st.set_page_config(page_title="Medi-Learn Protokolle Scraper", layout="wide")
 st.title("Medi-Learn Facharztprüfungen — Scraper")
 
 # ---------- Helpers ----------
+def is_cacheable(resp: requests.Response) -> bool:
+    """
+    requests-cache filter: store only data pages (and HEAD probes).
+    Runs before the body is read, so everything that could be large is rejected
+    from the headers alone; resp.content is only touched for small 200s.
+    """
+    if resp.status_code != 200:
+        return False
+    if resp.request.method == "HEAD":
+        return True
+    length = resp.headers.get("Content-Length", "")
+    if not length.isdigit():
+        return False
+    # Content-Length is the wire size; leave room for compression of encoded bodies
+    encoded = resp.headers.get("Content-Encoding", "identity") != "identity"
+    if int(length) > (MAX_BODY_BYTES // 10 if encoded else MAX_BODY_BYTES):
+        return False
+    return b"diensttabelle" in resp.content
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """One pooled keep-alive session shared across reruns and worker threads.
+
+    Responses are cached on disk for a day, so re-running over the same ID
+    range (e.g. with different filters) is served locally. Only pages that
+    carry the data table are cached: a "not found" page may be published
+    later, so it must be refetched on the next scan.
+    """
+    s = requests_cache.CachedSession(
+        "medilearn_cache",
+        backend="sqlite",
+        expire_after=86400,
+        filter_fn=is_cacheable,
+    )
+    s.headers.update({
+        "User-Agent": "Mozilla/5.0 (compatible; StreamlitScraper/1.0)",
+        "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
+        # Every encoding urllib3 can transparently decode here (br needs brotli)
+        "Accept-Encoding": ACCEPT_ENCODING,
+    })
+    adapter = HTTPAdapter(pool_connections=MAX_CONCURRENCY, pool_maxsize=MAX_CONCURRENCY)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
 def normalize_label(raw_label: str) -> str:
     """Normalize label text: trim, drop trailing colon, collapse spaces."""
     if raw_label is None:
         return ""
+    if raw_label in TARGET_LABELS:
+        return raw_label
     text = raw_label.strip()
-    text = re.sub(r"[:：]\s*$", "", text)
-    text = re.sub(r"\s+", " ", text)
+    text = _TRAILING_COLON.sub("", text)
+    text = _WS.sub(" ", text)
     return text
 
-def extract_fields_from_table(soup: BeautifulSoup) -> Optional[Dict[str, str]]:
+def extract_fields_from_table(tree: HTMLParser) -> Optional[Dict[str, str]]:
     """
     Parse table.diensttabelle.
     - Rows with 2+ cells: label in first cell, value in second.
     - A following <td colspan="2"> row is a continuation of the last label's value
       (used by long 'Gespräch' / 'Vorgespräch' text blocks).
     """
-    table = soup.select_one("table.diensttabelle")
-    if not table:
+    table = tree.css_first("table.diensttabelle")
+    if table is None:
         return None
 
     data = {v: "" for v in TARGET_LABELS.values()}
     current_key = None
 
-    def clean_text(el) -> str:
-        return el.get_text(separator="\n", strip=True)
-
-    for row in table.select("tr"):
-        cells = row.find_all(["td", "th"])
+    for row in table.css("tr"):
+        # Direct children only; cheaper than running a CSS selector per row
+        cells = [c for c in row.iter() if c.tag in ("td", "th")]
         if not cells:
             continue
 
         # Case 1: label/value on the same row
         if len(cells) >= 2:
-            label = normalize_label(cells[0].get_text(separator=" ", strip=True))
+            # Labels are usually a single bare text node; read it directly then
+            # (like bs4's .string) and only walk the subtree otherwise
+            first = cells[0].child
+            if first is not None and first.tag == "-text" and first.next is None:
+                label = normalize_label(first.text_content)
+            else:
+                label = normalize_label(cells[0].text(separator=" ", strip=True))
             if label in TARGET_LABELS:
                 key = TARGET_LABELS[label]
-                value = clean_text(cells[1])
+                value = cells[1].text(separator="\n", strip=True)
                 data[key] = (data[key] + ("\n" if data[key] and value else "") + value).strip()
                 current_key = key
                 continue
 
         # Case 2: continuation row spanning both columns
-        if len(cells) == 1 and cells[0].name == "td" and cells[0].has_attr("colspan"):
-            cont_text = clean_text(cells[0])
+        if len(cells) == 1 and cells[0].tag == "td" and "colspan" in cells[0].attributes:
+            cont_text = cells[0].text(separator="\n", strip=True)
             if current_key and cont_text:
                 data[current_key] = (data[current_key] + ("\n" if data[current_key] else "") + cont_text).strip()
             continue
@@ -82,20 +190,109 @@ def extract_fields_from_table(soup: BeautifulSoup) -> Optional[Dict[str, str]]:
         return data
     return None
 
-def fetch_page(page_id: int, session: Optional[requests.Session] = None) -> Tuple[bool, Optional[Dict[str, str]], int]:
+def _html_to_text(parts: List[str]) -> str:
+    """
+    Plain-string equivalent of node.text(separator="\\n", strip=True) for a
+    value split on <br> (newlines normalized, no other markup).
+    """
+    # Like lexbor, keep whitespace-only text nodes as empty lines
+    return "\n".join(html.unescape(p).strip() for p in parts if p)
+
+def extract_fields_fast(page: str) -> Optional[Dict[str, str]]:
+    """
+    Regex extraction of table.diensttabelle without building a DOM.
+    Returns None unless every row of the table is a plain label/value pair, so
+    continuation rows, nested tables or unexpected markup fall back to
+    extract_fields_from_table.
+    """
+    start = page.find("diensttabelle")
+    if start < 0:
+        return None
+    end = page.find("</table>", start)
+    segment = page[start:end] if end >= 0 else page[start:]
+    if "colspan" in segment or "<table" in segment or "<!--" in segment:
+        return None
+    # The HTML tokenizer turns CRLF and lone CR into LF before building text nodes
+    segment = segment.replace("\r\n", "\n").replace("\r", "\n")
+
+    matches = _FAST_ROW.findall(segment)
+    if not matches or len(matches) != segment.count("<tr"):
+        return None
+
+    data = {v: "" for v in TARGET_LABELS.values()}
+    for label, value_html in matches:
+        parts = _BR.split(value_html)
+        if any(_MARKUP.search(p) for p in parts):
+            return None
+        key = TARGET_LABELS[label]
+        value = _html_to_text(parts)
+        data[key] = (data[key] + ("\n" if data[key] and value else "") + value).strip()
+
+    if any(v.strip() for v in data.values()):
+        return data
+    return None
+
+def read_capped(resp: requests.Response, limit: int) -> bytes:
+    """
+    Read at most `limit` (decompressed) bytes from a streamed response.
+    Only bounds the download if the session left the body unread, which is why
+    is_cacheable never caches bodies that could exceed MAX_BODY_BYTES.
+    """
+    buf = bytearray()
+    for chunk in resp.iter_content(chunk_size=64 * 1024):
+        buf += chunk
+        if len(buf) >= limit:
+            break
+    return bytes(buf[:limit])
+
+def decode_body(resp: requests.Response, body: bytes) -> str:
+    """Decode like resp.text would, but for an already-read (possibly truncated) body."""
+    try:
+        return body.decode(resp.encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+def fetch_page(
+    page_id: int,
+    session: Optional[requests.Session] = None,
+    bypass_cache: bool = False,
+    head_probe: bool = False,
+) -> Tuple[bool, Optional[Dict[str, str]], int]:
     """Fetch and parse a page. Returns (found, record, http_status)."""
     url = BASE_URL.format(page_id=page_id)
-    s = session or requests.Session()
+    s = session or get_session()
+    # no-cache skips the cached copy but still stores the fresh response
+    headers = {"Cache-Control": "no-cache"} if bypass_cache else None
+
+    # A bodiless HEAD rules out non-200 IDs without downloading the page
+    if head_probe:
+        try:
+            head = s.head(url, timeout=5, allow_redirects=True, headers=headers)
+        except requests.RequestException:
+            return False, None, 0
+        if head.status_code != 200:
+            return False, None, head.status_code
+
     try:
-        resp = s.get(url, timeout=15)
+        # Stream so oversized bodies are cut off at MAX_BODY_BYTES. Smaller bodies
+        # (non-200s included) are read to the end, so the connection stays reusable.
+        with s.get(url, timeout=(5, 10), headers=headers, stream=True) as resp:
+            body = read_capped(resp, MAX_BODY_BYTES)
     except requests.RequestException:
         return False, None, 0
 
     if resp.status_code != 200:
         return False, None, resp.status_code
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    parsed = extract_fields_from_table(soup)
+    # Most misses are 200s without the table; a byte scan is far cheaper than a parse
+    if b"diensttabelle" not in body:
+        return False, None, 200
+
+    # lexbor does not sniff <meta charset>, so decode with the charset from the headers
+    page = decode_body(resp, body)
+    parsed = extract_fields_fast(page)
+    if parsed is None:
+        parsed = extract_fields_from_table(HTMLParser(page))
     if parsed is None:
         return False, None, 200
 
@@ -103,24 +300,95 @@ def fetch_page(page_id: int, session: Optional[requests.Session] = None) -> Tupl
     parsed["url"] = url
     return True, parsed, 200
 
+def fetch_page_delayed(
+    page_id: int,
+    session: requests.Session,
+    delay_s: float,
+    bypass_cache: bool = False,
+    head_probe: bool = False,
+) -> Tuple[bool, Optional[Dict[str, str]], int]:
+    """fetch_page preceded by a politeness pause; runs on a worker thread."""
+    if delay_s > 0:
+        time.sleep(delay_s)
+    return fetch_page(page_id, session=session, bypass_cache=bypass_cache, head_probe=head_probe)
+
+def append_live_record(live: pa.Table, record: Dict[str, str]) -> pa.Table:
+    """Append one record to the live Arrow table, keeping only the last LIVE_WINDOW rows."""
+    live = pa.concat_tables([live, pa.Table.from_pylist([record], schema=RECORD_SCHEMA)])
+    if live.num_rows > LIVE_WINDOW:
+        live = live.slice(live.num_rows - LIVE_WINDOW)
+    if live.column(0).num_chunks >= LIVE_RECHUNK_AT:
+        live = live.combine_chunks()
+    return live
+
+def render_live_table(placeholder) -> None:
+    """Show the most recent records in insertion order (pageIds arrive ascending)."""
+    live = st.session_state.live_table
+    if live.num_rows == 0:
+        placeholder.info("No results yet…")
+        return
+    # Arrow goes to the frontend as is, without a pandas round-trip
+    placeholder.dataframe(live, use_container_width=True, hide_index=True)
+
+def spool_records(
+    writer: Optional[pq.ParquetWriter], path: str, buffer: List[Dict[str, str]]
+) -> Optional[pq.ParquetWriter]:
+    """Append buffered records to the run's Parquet file as one row group (opened on first use)."""
+    if not buffer:
+        return writer
+    if writer is None:
+        writer = pq.ParquetWriter(path, RECORD_SCHEMA, compression="zstd")
+    writer.write_table(pa.Table.from_pylist(buffer, schema=RECORD_SCHEMA))
+    buffer.clear()
+    return writer
+
+def load_spooled_records(paths: Tuple[str, ...]) -> pd.DataFrame:
+    """Read back every record spooled during this session, sorted by pageId."""
+    frames = [pd.read_parquet(p, engine="pyarrow") for p in paths]
+    return pd.concat(frames, ignore_index=True)[list(ORDERED_COLS)].sort_values("page_id")
+
 def to_excel_bytes(df: pd.DataFrame) -> bytes:
+    # No constant_memory: pandas writes cells column by column, which that mode
+    # cannot handle (earlier columns would be dropped).
     buf = io.BytesIO()
-    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+    with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
         df.to_excel(writer, index=False, sheet_name="protokolle")
     return buf.getvalue()
 
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+    return buf.getvalue()
+
 def _norm(s: Optional[str]) -> str:
     return (s or "").casefold().strip()
 
-def matches_filters(record: Dict[str, str], uni_filter: str, fach_filter: str) -> bool:
-    """True iff record matches all provided filters (case-insensitive)."""
-    ok_uni = True
-    ok_fach = True
-    if uni_filter.strip():
-        ok_uni = _norm(uni_filter) in _norm(record.get("ort_uni", ""))
-    if fach_filter.strip():
-        ok_fach = _norm(fach_filter) in _norm(record.get("fach", ""))
-    return ok_uni and ok_fach
+def matches_filters(record: Dict[str, str], uni_norm: str, fach_norm: str) -> bool:
+    """True iff record matches all provided filters (case-insensitive).
+
+    Filters are expected pre-normalized with _norm(), once per run; the record
+    side only needs casefolding since stripping cannot change a substring match.
+    """
+    if uni_norm and uni_norm not in (record.get("ort_uni") or "").casefold():
+        return False
+    if fach_norm and fach_norm not in (record.get("fach") or "").casefold():
+        return False
+    return True
+
+def filter_frame(df: pd.DataFrame, uni_norm: str, fach_norm: str) -> pd.DataFrame:
+    """Vectorized matches_filters over a whole results frame.
+
+    Casefolds explicitly: case=False does not fold e.g. "ß" to "ss".
+    """
+    if uni_norm:
+        df = df[df["ort_uni"].str.casefold().str.contains(uni_norm, regex=False, na=False)]
+    if fach_norm:
+        df = df[df["fach"].str.casefold().str.contains(fach_norm, regex=False, na=False)]
+    return df
+
+def export_frame(paths: Tuple[str, ...], uni_norm: str, fach_norm: str) -> pd.DataFrame:
+    """All spooled records matching the filters; read from disk only when exporting."""
+    return filter_frame(load_spooled_records(paths), uni_norm, fach_norm)
 
 # ---------- Sidebar ----------
 with st.sidebar:
@@ -132,6 +400,20 @@ with st.sidebar:
         help="Stop early if this many IDs in a row have no usable data."
     )
     delay_ms = st.number_input("Delay between requests (ms)", min_value=0, value=300, step=50)
+    concurrency = st.number_input(
+        "Concurrent requests", min_value=1, max_value=MAX_CONCURRENCY, value=8, step=1,
+        help="Number of pages fetched in parallel. Each request still waits the delay above."
+    )
+    bypass_cache = st.checkbox(
+        "Bypass cache",
+        help="Always fetch fresh pages instead of reusing responses cached during the last 24h."
+    )
+    use_head_probe = st.checkbox(
+        "Probe with HEAD first",
+        help="Send a HEAD request before each GET and skip IDs that don't return 200. "
+             "Saves bandwidth on long miss streaks, but only helps if the server answers HEAD "
+             "differently from GET for missing pages."
+    )
 
     st.divider()
     st.header("Filters (optional)")
@@ -139,11 +421,19 @@ with st.sidebar:
     fach_filter = st.text_input("Fach contains …", placeholder="e.g., Innere Medizin")
     st.caption("Only records matching all provided filters will be saved & exported.")
 
+uni_norm = _norm(uni_filter)
+fach_norm = _norm(fach_filter)
+
 # ---------- Session state ----------
-if "records" not in st.session_state:
-    st.session_state.records: List[Dict[str, str]] = []
+if "live_table" not in st.session_state:
+    st.session_state.live_table: pa.Table = RECORD_SCHEMA.empty_table()
 if "seen_ids" not in st.session_state:
     st.session_state.seen_ids: Set[int] = set()
+if "spool_dir" not in st.session_state:
+    # Removed on Clear, or when the session's state is garbage-collected
+    st.session_state.spool_dir = tempfile.TemporaryDirectory(prefix="medilearn_")
+if "spool_files" not in st.session_state:
+    st.session_state.spool_files: List[str] = []
 
 # ---------- Controls ----------
 col1, col2, col3 = st.columns([1, 1, 2])
@@ -153,8 +443,11 @@ with col2:
     clear = st.button("Clear Results")
 
 if clear:
-    st.session_state.records = []
+    st.session_state.spool_dir.cleanup()
+    st.session_state.spool_dir = tempfile.TemporaryDirectory(prefix="medilearn_")
+    st.session_state.live_table = RECORD_SCHEMA.empty_table()
     st.session_state.seen_ids = set()
+    st.session_state.spool_files = []
     st.success("Cleared in-session results.")
 
 # ---------- Scrape loop ----------
@@ -163,63 +456,96 @@ if run:
     status = st.empty()
     table_placeholder = st.empty()
 
-    s = requests.Session()
-    s.headers.update({
-        "User-Agent": "Mozilla/5.0 (compatible; StreamlitScraper/1.0)",
-        "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
-    })
+    s = get_session()
 
     found_count = 0
     miss_streak = 0
+    last_render = 0.0
 
-    for i, page_id in enumerate(range(start_id, start_id + int(max_pages))):
-        pct = int(((i + 1) / max_pages) * 100)
-        progress.progress(pct, text=f"Scraping pageId={page_id} ({pct}%)")
-
-        found, record, code = fetch_page(page_id, session=s)
-        if found and record:
-            # Page found ⇒ reset miss streak
-            miss_streak = 0
-
-            # Filter & dedupe by page_id
-            if matches_filters(record, uni_filter, fach_filter):
-                if page_id not in st.session_state.seen_ids:
-                    st.session_state.seen_ids.add(page_id)
-                    st.session_state.records.append(record)
-                    found_count += 1
-                    status.info(f"✅ Saved pageId={page_id} (HTTP {code})")
-                else:
-                    status.info(f"↺ Skipped duplicate pageId={page_id}")
-            else:
-                status.info(f"➖ Skipped pageId={page_id} (doesn't match filters)")
-        else:
-            miss_streak += 1
-            status.warning(f"❌ Missing/empty pageId={page_id} (HTTP {code}) | Miss streak: {miss_streak}")
-
-        # Live table
-        if st.session_state.records:
-            df_live = pd.DataFrame(st.session_state.records)
-            ordered_cols = [
-                "page_id", "url",
-                "fach", "ort_uni", "pruefer", "atmosphaere",
-                "dauer", "note", "vorgespraech", "kleidung", "gespraech",
-            ]
-            for c in ordered_cols:
-                if c not in df_live.columns:
-                    df_live[c] = ""
-            df_live = df_live[ordered_cols].sort_values("page_id")
-            table_placeholder.dataframe(df_live, use_container_width=True, hide_index=True)
-        else:
-            table_placeholder.info("No results yet…")
-
-        # Stop early on consecutive misses
-        if miss_streak >= int(miss_streak_limit):
-            status.error(f"Stopped early after {miss_streak} consecutive missing pages.")
-            break
+    page_ids = list(range(start_id, start_id + int(max_pages)))
+    stopped = False
 
-        if delay_ms > 0:
-            time.sleep(delay_ms / 1000.0)
+    # Saved records go to disk in row groups; only the recent window stays in memory
+    spool_path = os.path.join(
+        st.session_state.spool_dir.name, f"scrape_{start_id}_{len(st.session_state.spool_files)}.parquet"
+    )
+    spool_buffer: List[Dict[str, str]] = []
+    spool_writer: Optional[pq.ParquetWriter] = None
+
+    # IDs saved by an earlier run are already in the results; don't refetch them
+    already_saved = set(st.session_state.seen_ids)
 
+    def fetch_one(pid: int) -> Tuple[bool, Optional[Dict[str, str]], int]:
+        if pid in already_saved:
+            return False, None, 0
+        return fetch_page_delayed(pid, s, delay_ms / 1000.0, bypass_cache, use_head_probe)
+
+    # Fetch a window of IDs concurrently, then handle the results in pageId order
+    # so the miss streak and live table behave as in a sequential scan.
+    try:
+        with ThreadPoolExecutor(max_workers=int(concurrency)) as pool:
+            for w_start in range(0, len(page_ids), FETCH_WINDOW):
+                batch = page_ids[w_start:w_start + FETCH_WINDOW]
+                futures = {pool.submit(fetch_one, pid): pid for pid in batch}
+                results = {}
+                for done, future in enumerate(as_completed(futures), start=w_start + 1):
+                    results[futures[future]] = future.result()
+                    pct = int((done / max_pages) * 100)
+                    progress.progress(pct, text=f"Scraping pageIds {batch[0]}–{batch[-1]} ({pct}%)")
+
+                for page_id in batch:
+                    found, record, code = results[page_id]
+
+                    if page_id in already_saved:
+                        # Known page ⇒ counts as a hit for the miss streak
+                        miss_streak = 0
+                        status.info(f"↺ Skipped duplicate pageId={page_id}")
+                    elif found and record:
+                        # Page found ⇒ reset miss streak
+                        miss_streak = 0
+
+                        # Filter & dedupe by page_id
+                        if matches_filters(record, uni_norm, fach_norm):
+                            if page_id not in st.session_state.seen_ids:
+                                st.session_state.seen_ids.add(page_id)
+                                st.session_state.live_table = append_live_record(
+                                    st.session_state.live_table, record
+                                )
+                                spool_buffer.append(record)
+                                if len(spool_buffer) >= SPOOL_FLUSH_EVERY:
+                                    spool_writer = spool_records(spool_writer, spool_path, spool_buffer)
+                                found_count += 1
+                                status.info(f"✅ Saved pageId={page_id} (HTTP {code})")
+                            else:
+                                status.info(f"↺ Skipped duplicate pageId={page_id}")
+                        else:
+                            status.info(f"➖ Skipped pageId={page_id} (doesn't match filters)")
+                    else:
+                        miss_streak += 1
+                        status.warning(f"❌ Missing/empty pageId={page_id} (HTTP {code}) | Miss streak: {miss_streak}")
+
+                    # Stop early on consecutive misses
+                    if miss_streak >= int(miss_streak_limit):
+                        status.error(f"Stopped early after {miss_streak} consecutive missing pages.")
+                        stopped = True
+                        break
+
+                # Live table, refreshed once per window and at most every LIVE_TABLE_INTERVAL_S
+                now = time.monotonic()
+                if now - last_render >= LIVE_TABLE_INTERVAL_S:
+                    render_live_table(table_placeholder)
+                    last_render = now
+
+                if stopped:
+                    break
+    finally:
+        spool_writer = spool_records(spool_writer, spool_path, spool_buffer)
+        if spool_writer is not None:
+            spool_writer.close()
+            st.session_state.spool_files.append(spool_path)
+
+    # The Results section below renders the final table once
+    table_placeholder.empty()
     progress.empty()
     st.success(f"Done. Saved {found_count} matching pages.")
 
@@ -233,33 +559,36 @@ if active_filters:
     st.info("Active filters → " + " | ".join(active_filters))
 
 st.subheader("Results")
-if st.session_state.records:
-    df = pd.DataFrame(st.session_state.records)
-    ordered_cols = [
-        "page_id", "url",
-        "fach", "ort_uni", "pruefer", "atmosphaere",
-        "dauer", "note", "vorgespraech", "kleidung", "gespraech",
-    ]
-    for c in ordered_cols:
-        if c not in df.columns:
-            df[c] = ""
-    df = df[ordered_cols].sort_values("page_id")
-    st.dataframe(df, use_container_width=True, hide_index=True)
-
-    # Download as Excel
-    excel_bytes = to_excel_bytes(df)
+if st.session_state.spool_files:
+    # Only the in-memory window is shown; the full result set stays on disk and
+    # is read back (and serialized) only when a download is actually clicked
+    spool_paths = tuple(st.session_state.spool_files)
+    df_recent = st.session_state.live_table.to_pandas().sort_values("page_id")
+    df_recent = filter_frame(df_recent, uni_norm, fach_norm)
+    st.caption(
+        f"Showing the {len(df_recent)} most recent matching records "
+        f"({len(st.session_state.seen_ids)} saved in total). Downloads include all matching records."
+    )
+    st.dataframe(df_recent, use_container_width=True, hide_index=True)
+
     st.download_button(
         label="⬇️ Download as Excel (.xlsx)",
-        data=excel_bytes,
+        data=lambda: to_excel_bytes(export_frame(spool_paths, uni_norm, fach_norm)),
         file_name="medi_learn_protokolle.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
+    st.download_button(
+        label="⬇️ Download as Parquet",
+        data=lambda: to_parquet_bytes(export_frame(spool_paths, uni_norm, fach_norm)),
+        file_name="medi_learn_protokolle.parquet",
+        mime="application/vnd.apache.parquet",
+    )
 
     # Optional: also write to file on disk (local runs)
-    if st.checkbox("Also write XLSX to app folder"):
+    if st.button("Write XLSX to app folder"):
         out_path = "medi_learn_protokolle.xlsx"
         with open(out_path, "wb") as f:
-            f.write(excel_bytes)
+            f.write(to_excel_bytes(export_frame(spool_paths, uni_norm, fach_norm)))
         st.success(f"Wrote file: {out_path}")
 else:
     st.info("No data yet. Click **Start Scraping** to begin.")